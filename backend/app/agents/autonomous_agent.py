@@ -1,45 +1,92 @@
 from google.adk.agents import Agent
+from app.agents.models import get_gemini
 from app.agents.tools.goal_tools import track_goal_progress
-from app.agents.tools.safety_tools import check_safety_constraints
-from app.models.request import AutonomousRequest, GoalState
+from app.agents.tools.safety_tools import check_safety_constraints, find_escalation_keyword
+from app.core import clock
+from app.core.ids import new_id
+from app.models.request import AnyGoalState, AutonomousRequest, Message
 from app.models.response import AutonomousResponse
-import os
-import time
-import uuid
+from app.services.context_budget import trim_messages
+from functools import lru_cache
+from pydantic.type_adapter import TypeAdapter
+from typing import List
+
+# Static system prompt. Kept identical across requests so Gemini can reuse the
+# cached prefix; per-request values go in the user turn.
+SYSTEM_PREFIX = """You are an autonomous customer support agent.
+Analyze the goal, check safety constraints, and decide the next action.
+Use tools to track progress and validate safety before responding.
+
+Each task provides:
+- Goal: the outcome to reach and the maximum number of turns
+- Safety Constraints: the minimum confidence required to respond and the
+  escalation keywords that require handing off to a human agent
+- Conversation: lines formatted as ROLE: message, oldest first
+- Current Turn and Progress toward the goal
+
+Decide: respond, escalate, or goal_complete"""
+
+# Validates the tool's goal-state dict into the state class named by its kind.
+# mypy sees the Annotated union as a special form rather than a type argument.
+_GOAL_STATE_ADAPTER: TypeAdapter[AnyGoalState] = TypeAdapter(AnyGoalState)  # type: ignore[arg-type]
+
+
+def _pending_customer_messages(messages: List[Message]) -> List[str]:
+    """Customer messages since the last agent message, oldest first"""
+    # Earlier turns were already answered; rescanning them would escalate every
+    # later turn, even after a human resumes YOLO mode
+    pending: List[str] = []
+    for message in reversed(messages):
+        if message.role == "agent":
+            break
+        pending.append(message.content)
+    pending.reverse()
+    return pending
+
+
+@lru_cache(maxsize=None)
+def get_autonomous_agent() -> Agent:
+    """Build the autonomous agent once per process"""
+    # ADK reads GOOGLE_CLOUD_PROJECT/GOOGLE_CLOUD_REGION, set once at app startup
+    # Single agent with Gemini 2.5 Flash and safety tools
+    return Agent(
+        name="autonomous_agent",
+        model=get_gemini(),
+        instruction=SYSTEM_PREFIX,
+        description="Handles autonomous YOLO mode responses",
+        tools=[track_goal_progress, check_safety_constraints]
+    )
 
 
 class AutonomousAgentService:
     """Single-agent service for YOLO Mode (Gemini 2.5 Flash)"""
 
     def __init__(self, project_id: str, location: str):
-        # Set environment variables for ADK
-        os.environ["GOOGLE_CLOUD_PROJECT"] = project_id
-        os.environ["GOOGLE_CLOUD_REGION"] = location
-
-        # Single agent with Gemini 2.5 Flash and safety tools
-        self.agent = Agent(
-            name="autonomous_agent",
-            model="gemini-2.5-flash",
-            instruction="""You are an autonomous customer support agent.
-            Analyze the goal, check safety constraints, and decide the next action.
-            Use tools to track progress and validate safety before responding.""",
-            description="Handles autonomous YOLO mode responses",
-            tools=[track_goal_progress, check_safety_constraints]
-        )
+        self.project_id = project_id
+        self.location = location
+        self.agent = get_autonomous_agent()
 
-    async def process(self, request: AutonomousRequest) -> AutonomousResponse:
-        """Process autonomous request with single agent"""
-        # Build prompt with goal and safety context
-        messages_text = "\n".join([
-            f"{msg.role.upper()}: {msg.content}"
-            for msg in request.conversation_context
-        ])
+    async def _run_agent(self, prompt: str) -> str:
+        """Run the agent on a single prompt"""
+        # TODO: Actual ADK agent invocation with tool calls
+        # The agent will:
+        # 1. Call track_goal_progress() to update state
+        # 2. Generate response
+        # 3. Call check_safety_constraints() to validate
+        # 4. Return action decision
+        # response = await self.agent.run(prompt)
 
-        prompt = f"""Autonomous support task:
+        # Placeholder response
+        return "I'm here to help resolve your issue. Let me gather some information."
 
-Goal: {request.goal.description} (Max turns: {request.goal.max_turns})
-Current Turn: {request.goal_state.current_turn}/{request.goal.max_turns}
-Progress: {request.goal_state.progress:.1%}
+    def _build_prompt(self, request: AutonomousRequest) -> str:
+        """Build the per-request prompt with goal and safety context"""
+        messages_text = trim_messages(request.conversation_context)
+
+        # Ordered from most to least stable within a session: goal and constraints
+        # are fixed, the conversation only grows, and turn/progress change every
+        # call, so successive turns share the longest possible cached prefix
+        return f"""Goal: {request.goal.description} (Max turns: {request.goal.max_turns})
 
 Safety Constraints:
 - Min confidence: {request.safety_constraints.min_confidence}
@@ -48,48 +95,66 @@ Safety Constraints:
 Conversation:
 {messages_text}
 
-Decide: respond, escalate, or goal_complete"""
+Current Turn: {request.goal_state.current_turn}/{request.goal.max_turns}
+Progress: {request.goal_state.progress:.1%}"""
 
-        # TODO: Actual ADK agent invocation with tool calls
-        # The agent will:
-        # 1. Call track_goal_progress() to update state
-        # 2. Generate response
-        # 3. Call check_safety_constraints() to validate
-        # 4. Return action decision
+    async def process(self, request: AutonomousRequest) -> AutonomousResponse:
+        """Process autonomous request with single agent"""
+        # Dump request models once for the dict-based tool functions
+        safety_dict = request.safety_constraints.model_dump()
+        goal_dict = request.goal.model_dump()
+        state_dict = request.goal_state.model_dump()
 
-        # Placeholder response with safety check
-        response_text = "I'm here to help resolve your issue. Let me gather some information."
-        
-        # Check safety
-        safety_result = check_safety_constraints(
-            response_text,
-            request.safety_constraints.dict(),
-            0.8
+        # Escalate on keywords from the customer without calling the model
+        keyword = find_escalation_keyword(
+            _pending_customer_messages(request.conversation_context),
+            request.safety_constraints.escalation_keywords
         )
 
-        if safety_result["decision"] == "escalate":
+        if keyword is not None:
             action = "escalate"
             response_text = None
+            reason = f"Safety violations: escalation_keyword:{keyword}"
         else:
-            action = "respond"
+            response_text = await self._run_agent(self._build_prompt(request))
+
+            # Check safety
+            safety_result = check_safety_constraints(
+                response_text,
+                safety_dict,
+                0.8
+            )
+
+            if safety_result["decision"] == "escalate":
+                action = "escalate"
+                response_text = None
+            else:
+                action = "respond"
+            reason = safety_result["reason"]
 
         # Update goal state
         updated_state = track_goal_progress(
-            request.goal.dict(),
-            request.goal_state.dict(),
+            goal_dict,
+            state_dict,
             action
         )
+        if action == "escalate":
+            updated_state.update(kind="escalated", active=False)
+        elif not updated_state["active"]:
+            # Goal resolved or out of turns; this reply is the last one
+            updated_state["kind"] = "completed"
 
-        return AutonomousResponse(
+        # All fields come from this method or validated tool output
+        return AutonomousResponse.model_construct(
             action=action,
             response_text=response_text,
-            updated_state=GoalState(**updated_state),
-            reasoning=f"Decision based on goal and safety analysis: {safety_result['reason']}",
+            updated_state=_GOAL_STATE_ADAPTER.validate_python(updated_state),
+            reasoning=f"Decision based on goal and safety analysis: {reason}",
             confidence=0.8,
             metadata={
-                "request_id": str(uuid.uuid4()),
+                "request_id": new_id(),
                 "processing_time_ms": 1500,
                 "model_used": "gemini-2.5-flash",
-                "timestamp": int(time.time())
+                "timestamp": clock.now_int()
             }
         )
@@ -0,0 +1,13 @@
+from google.adk.models import Gemini
+from functools import lru_cache
+
+# Model shared by both agents
+GEMINI_MODEL = "gemini-2.5-flash"
+
+
+@lru_cache(maxsize=None)
+def get_gemini(model_name: str = GEMINI_MODEL) -> Gemini:
+    """Build one Gemini LLM per model name, shared across agents"""
+    # Gemini caches its google-genai API client on the instance, so agents
+    # given the same instance reuse one client and its connection pool
+    return Gemini(model=model_name)
@@ -1,56 +1,277 @@
 from google.adk.agents import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from app.agents.models import get_gemini
 from app.agents.tools.context_tools import process_conversation_context
 from app.models.request import SuggestRequest
 from app.models.response import Suggestion
-import os
+from app.services.context_budget import trim_messages
+from app.services.response_cache import RedisCache
+from cachetools import TTLCache
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional
+import asyncio
+import hashlib
+import logging
+import orjson
+import re
+
+logger = logging.getLogger(__name__)
+
+# Static system prompt. Kept identical across requests so Gemini can reuse the
+# cached prefix; per-request values go in the user turn.
+SYSTEM_PREFIX = """You are an AI assistant helping customer support agents.
+Generate helpful, empathetic response suggestions.
+Maintain a professional yet friendly tone.
+
+Each request lists its requirements followed by the conversation:
+- Tone: professional, friendly, or empathetic
+- Length: short, medium, or long
+- Language: language code for the response
+Conversation lines are formatted as ROLE: message, oldest first.
+
+Provide a helpful response that meets the requirements."""
+
+# Canned replies for trivial customer messages that don't need the model
+_GREETING_REPLY = "Hello! How can I help you today?"
+_ACK_REPLY = "You're welcome! Is there anything else I can help with?"
+_FAREWELL_REPLY = "Thank you for contacting support. Have a great day!"
+_TRIVIAL_REPLIES = {
+    "hi": _GREETING_REPLY,
+    "hello": _GREETING_REPLY,
+    "hey": _GREETING_REPLY,
+    "ok": _ACK_REPLY,
+    "okay": _ACK_REPLY,
+    "thanks": _ACK_REPLY,
+    "thank you": _ACK_REPLY,
+    "bye": _FAREWELL_REPLY,
+}
+_TRIVIAL_RE = re.compile(
+    r"\s*(" + "|".join(_TRIVIAL_REPLIES) + r")[!.?]*\s*", re.IGNORECASE
+)
+
+# Cache of generated suggestions for repeated (context, preferences) pairs
+CACHE_MAXSIZE = 2048
+CACHE_TTL_SECONDS = 300
+
+
+def _cache_key(request: SuggestRequest) -> str:
+    """Hash the conversation context and preferences of a request"""
+    payload = orjson.dumps(
+        [
+            [(m.role, m.content, m.timestamp) for m in request.conversation_context],
+            request.user_preferences.model_dump() if request.user_preferences else {},
+        ],
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    """Frame an event as a server-sent event"""
+    return f"data: {orjson.dumps(event).decode()}\n\n"
+
+
+def _event_text(event: Event) -> str:
+    """Response text carried by an ADK event, without thoughts or tool calls"""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+
+# Streamed runs use a throwaway session per request
+APP_NAME = "support-chat-ai"
+STREAM_USER_ID = "suggestion-stream"
+_SSE_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+
+@lru_cache(maxsize=None)
+def get_suggestion_agent() -> Agent:
+    """Build the suggestion agent once per process"""
+    # ADK reads GOOGLE_CLOUD_PROJECT/GOOGLE_CLOUD_REGION, set once at app startup
+    # Single agent with Gemini 2.5 Flash
+    return Agent(
+        name="suggestion_agent",
+        model=get_gemini(),
+        instruction=SYSTEM_PREFIX,
+        description="Generates response suggestions for support agents",
+        tools=[process_conversation_context]
+    )
+
+
+@lru_cache(maxsize=None)
+def get_suggestion_runner() -> Runner:
+    """Build the runner for streamed suggestions once per process"""
+    return Runner(
+        agent=get_suggestion_agent(),
+        app_name=APP_NAME,
+        session_service=InMemorySessionService()
+    )
 
 
 class SuggestionAgentService:
     """Single-agent service for Suggestion Mode (Gemini 2.5 Flash)"""
 
-    def __init__(self, project_id: str, location: str):
-        # Set environment variables for ADK
-        os.environ["GOOGLE_CLOUD_PROJECT"] = project_id
-        os.environ["GOOGLE_CLOUD_REGION"] = location
-
-        # Single agent with Gemini 2.5 Flash
-        self.agent = Agent(
-            name="suggestion_agent",
-            model="gemini-2.5-flash",
-            instruction="""You are an AI assistant helping customer support agents.
-            Generate helpful, empathetic response suggestions.
-            Maintain a professional yet friendly tone.""",
-            description="Generates response suggestions for support agents",
-            tools=[process_conversation_context]
+    def __init__(
+        self, project_id: str, location: str, shared_cache: Optional[RedisCache] = None
+    ):
+        self.project_id = project_id
+        self.location = location
+        self.agent = get_suggestion_agent()
+
+        # Fast-path hit rate
+        self.requests_total = 0
+        self.trivial_hits = 0
+
+        # Generated suggestions, and in-flight generations for identical requests
+        self._cache: TTLCache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS)
+        self._inflight: Dict[str, asyncio.Task[Suggestion]] = {}
+        # Cross-worker tier checked on a local miss
+        self.shared_cache = shared_cache or RedisCache()
+
+    async def _run_agent(self, prompt: str) -> str:
+        """Run the agent on a single prompt"""
+        # TODO: Actual ADK agent invocation
+        # response = await self.agent.run(prompt)
+        return (
+            "Thank you for contacting support. I understand your concern and I'm here to help "
+            "you resolve this issue."
         )
 
-    async def generate_suggestion(self, request: SuggestRequest) -> Suggestion:
-        """Generate suggestion with single ADK agent"""
-        # Build prompt
-        messages_text = "\n".join([
-            f"{msg.role.upper()}: {msg.content}"
-            for msg in request.conversation_context
-        ])
+    async def _stream_agent(self, prompt: str) -> AsyncIterator[str]:
+        """Stream response text from the agent as Gemini generates it"""
+        runner = get_suggestion_runner()
+        sessions = runner.session_service
+        session = await sessions.create_session(app_name=APP_NAME, user_id=STREAM_USER_ID)
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+        try:
+            # In SSE mode each model turn arrives as partial chunks followed by
+            # one aggregated event repeating the whole text; only a turn that
+            # was not streamed is taken from its aggregated event
+            streamed = False
+            async for event in runner.run_async(
+                user_id=STREAM_USER_ID,
+                session_id=session.id,
+                new_message=message,
+                run_config=_SSE_RUN_CONFIG
+            ):
+                text = _event_text(event)
+                if event.partial:
+                    if text:
+                        streamed = True
+                        yield text
+                    continue
+                if text and not streamed:
+                    yield text
+                streamed = False
+        finally:
+            await sessions.delete_session(
+                app_name=APP_NAME, user_id=STREAM_USER_ID, session_id=session.id
+            )
+
+    def _trivial_reply(self, request: SuggestRequest) -> Optional[Suggestion]:
+        """Canned suggestion for greetings and acknowledgements, if applicable"""
+        self.requests_total += 1
+
+        last = request.conversation_context[-1]
+        if last.role != "customer":
+            return None
+        match = _TRIVIAL_RE.fullmatch(last.content)
+        if not match:
+            return None
+
+        self.trivial_hits += 1
+        logger.debug(
+            f"Trivial message fast path: {self.trivial_hits}/{self.requests_total} requests"
+        )
+        return Suggestion.model_construct(
+            text=_TRIVIAL_REPLIES[match.group(1).lower()],
+            confidence=0.99,
+            reasoning="Trivial message fast path"
+        )
+
+    def _build_prompt(self, request: SuggestRequest) -> str:
+        """Build the per-request part of the prompt"""
+        messages_text = trim_messages(request.conversation_context)
+
+        prefs = request.user_preferences
+        tone = (prefs.tone if prefs else None) or "professional"
+        length = (prefs.length if prefs else None) or "medium"
 
-        prefs = request.user_preferences or {}
-        prompt = f"""Generate a {prefs.get('tone', 'professional')} customer support response.
+        # Conversation goes last so the cacheable prefix ends at a fixed boundary
+        return f"""Requirements:
+- Tone: {tone}
+- Length: {length}
+- Language: en
 
 Conversation:
-{messages_text}
+{messages_text}"""
 
-Requirements:
-- Tone: {prefs.get('tone', 'professional')}
-- Length: {prefs.get('length', 'medium')}
-- Language: {prefs.get('language', 'en')}
+    async def generate_suggestion(self, request: SuggestRequest) -> Suggestion:
+        """Generate suggestion with single ADK agent"""
+        # Skip the model for greetings and acknowledgements
+        trivial = self._trivial_reply(request)
+        if trivial:
+            return trivial
 
-Provide a helpful response."""
+        key = _cache_key(request)
+        cached: Optional[Suggestion] = self._cache.get(key)
+        if cached is not None:
+            return cached
 
-        # TODO: Actual ADK agent invocation
-        # response = await self.agent.run(prompt)
-        response_text = f"Thank you for contacting support. I understand your concern and I'm here to help you resolve this issue."
+        # Identical concurrent requests share one generation
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(request, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _generate(self, request: SuggestRequest, key: str) -> Suggestion:
+        """Generate a suggestion with the model and cache it"""
+        shared_key = f"suggestion:{key}"
+        cached = await self.shared_cache.get(shared_key)
+        if cached is not None:
+            suggestion = Suggestion.model_validate_json(cached)
+            self._cache[key] = suggestion
+            return suggestion
 
-        return Suggestion(
+        response_text = await self._run_agent(self._build_prompt(request))
+
+        suggestion = Suggestion.model_construct(
             text=response_text,
             confidence=0.85,
             reasoning="Generated with Gemini 2.5 Flash"
         )
+        self._cache[key] = suggestion
+        await self.shared_cache.set(
+            shared_key, suggestion.model_dump_json().encode(), CACHE_TTL_SECONDS
+        )
+        return suggestion
+
+    async def stream_suggestion(self, request: SuggestRequest) -> AsyncIterator[str]:
+        """
+        Stream a suggestion as server-sent events
+
+        Yields:
+            `data: {"delta": ...}` frames as text is generated, then a final
+            `data: {"done": true, ...}` frame (or `{"error": ...}` on failure)
+        """
+        trivial = self._trivial_reply(request)
+        try:
+            if trivial:
+                yield _sse({"delta": trivial.text})
+                confidence = trivial.confidence
+            else:
+                async for delta in self._stream_agent(self._build_prompt(request)):
+                    yield _sse({"delta": delta})
+                confidence = 0.85
+        except Exception as e:
+            logger.error(f"Error streaming suggestion: {str(e)}")
+            yield _sse({"error": f"Failed to generate suggestion: {str(e)}"})
+            return
+
+        yield _sse({"done": True, "confidence": confidence, "request_id": request.request_id})
@@ -1,6 +1,14 @@
 from typing import List, Dict
 import re
 
+# Entity patterns, compiled once at import
+_ORDER_RE = re.compile(r'#\d+')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Intent keywords; order intents take precedence over refund intents
+_ORDER_WORDS = ("order", "shipping", "delivery")
+_REFUND_WORDS = ("refund", "return", "cancel")
+
 
 def process_conversation_context(messages: List[Dict]) -> Dict:
     """
@@ -17,6 +25,7 @@ def process_conversation_context(messages: List[Dict]) -> Dict:
 
     processed = []
     entities = {"order_numbers": [], "emails": []}
+    intent = "general_inquiry"
 
     for msg in messages:
         content = msg.get("content", "").strip()
@@ -27,16 +36,17 @@ def process_conversation_context(messages: List[Dict]) -> Dict:
         })
 
         # Extract entities
-        entities["order_numbers"].extend(re.findall(r'#\d+', content))
-        entities["emails"].extend(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', content))
-
-    # Detect intent
-    all_content = " ".join([m["content"] for m in processed]).lower()
-    intent = "general_inquiry"
-    if any(w in all_content for w in ["order", "shipping", "delivery"]):
-        intent = "order_inquiry"
-    elif any(w in all_content for w in ["refund", "return", "cancel"]):
-        intent = "refund_request"
+        entities["order_numbers"].extend(m.group() for m in _ORDER_RE.finditer(content))
+        entities["emails"].extend(m.group() for m in _EMAIL_RE.finditer(content))
+
+        # Detect intent per message instead of over one joined copy of the
+        # conversation; nothing left to check once an order intent is found
+        if intent != "order_inquiry":
+            content_lower = content.lower()
+            if any(w in content_lower for w in _ORDER_WORDS):
+                intent = "order_inquiry"
+            elif intent == "general_inquiry" and any(w in content_lower for w in _REFUND_WORDS):
+                intent = "refund_request"
 
     return {
         "processed_messages": processed,
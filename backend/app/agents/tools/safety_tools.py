@@ -1,4 +1,21 @@
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
+
+_CONFUSION_PHRASES = ("i don't understand", "i'm not sure")
+
+
+def find_escalation_keyword(texts: Iterable[str], keywords: List[str]) -> Optional[str]:
+    """Return the first escalation keyword found in any of texts, or None"""
+    # Lowercase each keyword and each text once
+    terms = [(keyword.lower(), keyword) for keyword in keywords if keyword]
+    if not terms:
+        return None
+
+    for text in texts:
+        text_lower = text.lower()
+        for term, keyword in terms:
+            if term in text_lower:
+                return keyword
+    return None
 
 
 def check_safety_constraints(message: str, constraints: Dict, confidence: float) -> Dict:
@@ -18,7 +35,7 @@ def check_safety_constraints(message: str, constraints: Dict, confidence: float)
 
     # Check confusion
     if constraints.get("stop_if_confused", True):
-        if any(p in message_lower for p in ["i don't understand", "i'm not sure"]):
+        if any(p in message_lower for p in _CONFUSION_PHRASES):
             triggers.append("confusion_detected")
 
     if triggers:
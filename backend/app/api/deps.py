@@ -0,0 +1,11 @@
+"""Shared route dependencies"""
+
+from fastapi import Request
+
+from app.services.agent_service import AgentService
+
+
+def get_agent_service(request: Request) -> AgentService:
+    """Agent service created once per worker in the app lifespan"""
+    agent_service: AgentService = request.app.state.agent_service
+    return agent_service
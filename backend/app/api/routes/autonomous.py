@@ -1,16 +1,21 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
+from app.api.deps import get_agent_service
+from app.api.routing import ORJSONRoute
 from app.models.request import AutonomousRequest
 from app.models.response import AutonomousResponse
 from app.services.agent_service import AgentService
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
-agent_service = AgentService()
+router = APIRouter(route_class=ORJSONRoute)
 
 
 @router.post("/autonomous-response", response_model=AutonomousResponse)
-async def autonomous_response(request: AutonomousRequest):
+async def autonomous_response(
+    request: AutonomousRequest,
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Generate autonomous AI response (YOLO Mode)"""
     try:
         # Validate goal and constraints
@@ -30,7 +35,8 @@ async def autonomous_response(request: AutonomousRequest):
         # Process autonomous request
         response = await agent_service.generate_autonomous_response(request)
         
-        return response
+        # Serialize in pydantic-core directly; response_model is kept for the schema
+        return Response(content=response.model_dump_json(), media_type="application/json")
     
     except HTTPException:
         raise
@@ -1,25 +1,59 @@
+from collections import defaultdict
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from fastapi.responses import Response
+from pydantic.fields import Field
+from pydantic.functional_validators import field_validator
+from pydantic.main import BaseModel
+from pydantic.type_adapter import TypeAdapter
+from pydantic_core.core_schema import ValidationInfo
+from sortedcontainers import SortedList
+from typing import List, Optional, Dict, Any, DefaultDict, Hashable, Sequence, Tuple, TypeVar
+from app.api.routing import ORJSONRoute
+from app.core import clock
+from app.core.config import settings
+from app.core.ids import new_id
+from app.services.log_writer import log_writer
+import itertools
 import logging
-import uuid
+import orjson
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
+
+# Per-log payload limits
+MAX_LOG_ITEMS = 200
+MAX_LOG_FIELD_BYTES = 256_000
+
+# Most pages returned by one batch request
+MAX_BATCH_PAGES = 20
 
 
 class ConversationLog(BaseModel):
-    log_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    log_id: str = Field(default_factory=new_id)
     session_id: str
     mode: str = Field(..., description="suggestion or autonomous")
     goal_description: Optional[str] = None
-    conversation_context: List[Dict[str, Any]]
-    actions_taken: List[Dict[str, Any]]
+    conversation_context: List[Dict[str, Any]] = Field(..., max_length=MAX_LOG_ITEMS)
+    actions_taken: List[Dict[str, Any]] = Field(..., max_length=MAX_LOG_ITEMS)
     outcome: str = Field(..., description="completed, escalated, or interrupted")
-    timestamp: int = Field(default_factory=lambda: int(datetime.now().timestamp()))
+    timestamp: int = Field(default_factory=clock.now_int)
     metadata: Optional[Dict[str, Any]] = None
 
+    @field_validator("conversation_context", "actions_taken")
+    @classmethod
+    def check_size(cls, v: List[Dict[str, Any]], info: ValidationInfo) -> List[Dict[str, Any]]:
+        """Reject oversized payloads before they reach storage"""
+        # Stored logs were size-checked when they were saved
+        if info.context and info.context.get("stored"):
+            return v
+        if len(orjson.dumps(v)) > MAX_LOG_FIELD_BYTES:
+            raise ValueError(f"Payload too large (max {MAX_LOG_FIELD_BYTES} bytes)")
+        return v
+
+
+# Decodes a page of stored payloads in one call
+_LOG_PAGE_ADAPTER: TypeAdapter[List[ConversationLog]] = TypeAdapter(List[ConversationLog])
+
 
 class LogResponse(BaseModel):
     log_id: str
@@ -34,11 +68,61 @@ class LogsListResponse(BaseModel):
     page_size: int
 
 
-# In-memory storage for demo (replace with Firestore in production)
-conversation_logs_storage: Dict[str, ConversationLog] = {}
+class LogsBatchResponse(BaseModel):
+    pages: List[LogsListResponse]
+
+
+# In-memory storage for demo (replace with Firestore in production).
+# Logs are kept as orjson bytes and only the requested page is deserialized;
+# the filter fields live in the index keys and _log_fields instead.
+# Index entries are (-timestamp, insertion_seq, log_id), so every index
+# iterates newest first with ties kept in insertion order.
+IndexKey = Tuple[int, int, str]
+K = TypeVar("K", bound=Hashable)
+
+_payloads: Dict[str, bytes] = {}
+_index_keys: Dict[str, IndexKey] = {}
+# log_id -> (session_id, mode), to find a log's index entries on re-save
+_log_fields: Dict[str, Tuple[str, str]] = {}
+_all_logs: SortedList = SortedList()
+_by_session: DefaultDict[str, SortedList] = defaultdict(SortedList)
+_by_mode: DefaultDict[str, SortedList] = defaultdict(SortedList)
+_by_session_mode: DefaultDict[Tuple[str, str], SortedList] = defaultdict(SortedList)
+_insertion_seq = itertools.count()
+
+
+def _unindex(index: DefaultDict[K, SortedList], key: K, entry: IndexKey) -> None:
+    """Remove an entry from one filter index, dropping its list once empty"""
+    entries = index[key]
+    entries.remove(entry)
+    if not entries:
+        del index[key]
+
 
+def _store_log(log: ConversationLog) -> None:
+    """Insert or replace a log in the primary store and all indexes"""
+    previous = _index_keys.get(log.log_id)
+    if previous is not None:
+        old_session, old_mode = _log_fields[log.log_id]
+        _all_logs.remove(previous)
+        _unindex(_by_session, old_session, previous)
+        _unindex(_by_mode, old_mode, previous)
+        _unindex(_by_session_mode, (old_session, old_mode), previous)
+        seq = previous[1]
+    else:
+        seq = next(_insertion_seq)
 
-@router.post("/conversation-logs", response_model=LogResponse)
+    key = (-log.timestamp, seq, log.log_id)
+    _payloads[log.log_id] = orjson.dumps(log.model_dump())
+    _index_keys[log.log_id] = key
+    _log_fields[log.log_id] = (log.session_id, log.mode)
+    _all_logs.add(key)
+    _by_session[log.session_id].add(key)
+    _by_mode[log.mode].add(key)
+    _by_session_mode[(log.session_id, log.mode)].add(key)
+
+
+@router.post("/conversation-logs", response_model=LogResponse, status_code=202)
 async def save_conversation_log(log: ConversationLog):
     """Save conversation log (primarily for YOLO mode audit trail)"""
     try:
@@ -53,9 +137,9 @@ async def save_conversation_log(log: ConversationLog):
                 detail="Outcome must be 'completed', 'escalated', or 'interrupted'"
             )
         
-        # TODO: Store in Firestore
-        # For now, store in memory
-        conversation_logs_storage[log.log_id] = log
+        # Indexed in memory for reads; persisted in the background by the batched writer
+        _store_log(log)
+        await log_writer.enqueue(settings.FIRESTORE_LOGS_COLLECTION, log.log_id, log.model_dump())
         
         logger.info(
             f"Conversation log saved: {log.log_id} | "
@@ -66,8 +150,8 @@ async def save_conversation_log(log: ConversationLog):
         
         return LogResponse(
             log_id=log.log_id,
-            status="success",
-            message="Conversation log saved successfully"
+            status="accepted",
+            message="Conversation log accepted for processing"
         )
     
     except HTTPException:
@@ -77,6 +161,40 @@ async def save_conversation_log(log: ConversationLog):
         raise HTTPException(status_code=500, detail=f"Failed to save log: {str(e)}")
 
 
+def _select_index(session_id: Optional[str], mode: Optional[str]) -> Sequence[IndexKey]:
+    """Pick the narrowest index for the filters (already sorted newest first)"""
+    if mode and mode not in ["suggestion", "autonomous"]:
+        raise HTTPException(status_code=400, detail="Mode must be 'suggestion' or 'autonomous'")
+
+    index: Sequence[IndexKey]
+    if session_id and mode:
+        index = _by_session_mode.get((session_id, mode), [])
+    elif session_id:
+        index = _by_session.get(session_id, [])
+    elif mode:
+        index = _by_mode.get(mode, [])
+    else:
+        index = _all_logs
+    return index
+
+
+def _paginate(index: Sequence[IndexKey], page: int, page_size: int) -> LogsListResponse:
+    """Slice one page from an index and decode only its logs"""
+    start_idx = (page - 1) * page_size
+    end_idx = start_idx + page_size
+    paginated_logs = _LOG_PAGE_ADAPTER.validate_json(
+        b"[" + b",".join(_payloads[key[2]] for key in index[start_idx:end_idx]) + b"]",
+        context={"stored": True}
+    )
+
+    return LogsListResponse.model_construct(
+        logs=paginated_logs,
+        total=len(index),
+        page=page,
+        page_size=page_size
+    )
+
+
 @router.get("/conversation-logs", response_model=LogsListResponse)
 async def get_conversation_logs(
     session_id: Optional[str] = Query(None, description="Filter by session ID"),
@@ -86,35 +204,45 @@ async def get_conversation_logs(
 ):
     """Retrieve conversation logs with optional filters"""
     try:
-        # Filter logs
-        filtered_logs = list(conversation_logs_storage.values())
-        
-        if session_id:
-            filtered_logs = [log for log in filtered_logs if log.session_id == session_id]
-        
-        if mode:
-            if mode not in ["suggestion", "autonomous"]:
-                raise HTTPException(status_code=400, detail="Mode must be 'suggestion' or 'autonomous'")
-            filtered_logs = [log for log in filtered_logs if log.mode == mode]
-        
-        # Sort by timestamp (newest first)
-        filtered_logs.sort(key=lambda x: x.timestamp, reverse=True)
-        
-        # Paginate
-        total = len(filtered_logs)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_logs = filtered_logs[start_idx:end_idx]
-        
-        return LogsListResponse(
-            logs=paginated_logs,
-            total=total,
-            page=page,
-            page_size=page_size
-        )
+        index = _select_index(session_id, mode)
+        response = _paginate(index, page, page_size)
+
+        # Serialize in pydantic-core directly; response_model is kept for the schema
+        return Response(content=response.model_dump_json(), media_type="application/json")
     
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error retrieving conversation logs: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve logs: {str(e)}")
+
+
+@router.get("/conversation-logs/batch", response_model=LogsBatchResponse)
+async def get_conversation_log_pages(
+    pages: List[int] = Query([1], description="Page numbers to return"),
+    session_id: Optional[str] = Query(None, description="Filter by session ID"),
+    mode: Optional[str] = Query(None, description="Filter by mode (suggestion/autonomous)"),
+    page_size: int = Query(10, ge=1, le=100, description="Items per page")
+) -> Response:
+    """Retrieve several pages of conversation logs in one round trip"""
+    try:
+        if len(pages) > MAX_BATCH_PAGES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {MAX_BATCH_PAGES} pages per request"
+            )
+        if any(page < 1 for page in pages):
+            raise HTTPException(status_code=400, detail="Page numbers must be at least 1")
+
+        index = _select_index(session_id, mode)
+        response = LogsBatchResponse.model_construct(
+            pages=[_paginate(index, page, page_size) for page in pages]
+        )
+
+        return Response(content=response.model_dump_json(), media_type="application/json")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving conversation log pages: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve logs: {str(e)}")
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from pydantic.fields import Field
+from pydantic.main import BaseModel
 from typing import Optional, Dict, Any
+from app.api.routing import ORJSONRoute
+from app.core import clock
+from app.core.config import settings
+from app.core.ids import new_id
+from app.services.log_writer import log_writer
 import logging
-import uuid
-import time
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 
 
 class FeedbackRequest(BaseModel):
@@ -24,14 +28,19 @@ class FeedbackResponse(BaseModel):
     message: str
 
 
-@router.post("/feedback", response_model=FeedbackResponse)
+@router.post("/feedback", response_model=FeedbackResponse, status_code=202)
 async def submit_feedback(feedback: FeedbackRequest):
     """Submit feedback on AI suggestions"""
     try:
-        feedback_id = str(uuid.uuid4())
+        feedback_id = new_id()
         
-        # TODO: Store feedback in Firestore or analytics system
-        # For now, just log it
+        # Persisted in the background by the batched writer
+        await log_writer.enqueue(
+            settings.FIRESTORE_FEEDBACK_COLLECTION,
+            feedback_id,
+            {**feedback.model_dump(), "timestamp": clock.now_int()}
+        )
+
         logger.info(
             f"Feedback received: {feedback_id} | "
             f"Request: {feedback.request_id} | "
@@ -45,8 +54,8 @@ async def submit_feedback(feedback: FeedbackRequest):
         
         return FeedbackResponse(
             feedback_id=feedback_id,
-            status="success",
-            message="Feedback recorded successfully"
+            status="accepted",
+            message="Feedback accepted for processing"
         )
     
     except Exception as e:
@@ -1,17 +1,24 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from app.api.routing import ORJSONRoute
 from app.models.request import SuggestRequest
 from app.models.response import SuggestResponse, Metadata
+from app.api.deps import get_agent_service
+from app.core import clock
+from app.core.ids import new_id
 from app.services.agent_service import AgentService
 import time
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
-agent_service = AgentService()
+router = APIRouter(route_class=ORJSONRoute)
 
 
 @router.post("/suggest-response", response_model=SuggestResponse)
-async def suggest_response(request: SuggestRequest):
+async def suggest_response(
+    request: SuggestRequest,
+    agent_service: AgentService = Depends(get_agent_service)
+):
     """Generate AI suggestion for support agent (Suggestion Mode)"""
     try:
         start_time = time.time()
@@ -25,16 +32,37 @@ async def suggest_response(request: SuggestRequest):
         
         processing_time = int((time.time() - start_time) * 1000)
         
-        return SuggestResponse(
+        # Built from trusted values; skip validation on the response path
+        response = SuggestResponse.model_construct(
             suggestions=[suggestion],
             metadata=Metadata(
-                request_id=request.request_id,
+                request_id=request.request_id or new_id(),
                 processing_time_ms=processing_time,
                 model_used="gemini-2.5-flash",
-                timestamp=int(time.time())
+                timestamp=clock.now_int()
             )
         )
+
+        # Serialize in pydantic-core directly; response_model is kept for the schema
+        return Response(content=response.model_dump_json(), media_type="application/json")
     
     except Exception as e:
         logger.error(f"Error generating suggestion: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate suggestion: {str(e)}")
+
+
+@router.post("/suggest-response/stream")
+async def suggest_response_stream(
+    request: SuggestRequest,
+    agent_service: AgentService = Depends(get_agent_service)
+) -> StreamingResponse:
+    """Stream AI suggestion as server-sent events (Suggestion Mode)"""
+    # Validate conversation context
+    if not request.conversation_context:
+        raise HTTPException(status_code=400, detail="Conversation context required")
+
+    return StreamingResponse(
+        agent_service.stream_suggestion(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
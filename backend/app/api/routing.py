@@ -0,0 +1,64 @@
+"""Route class that parses JSON request bodies with orjson"""
+
+import json
+import re
+from typing import Any, Callable, Coroutine
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+# Valid surrogate pairs are combined by the decoder, so any left are unpaired
+_SURROGATE_RE = re.compile("[\ud800-\udfff]")
+
+
+def _replace_lone_surrogates(value: Any) -> Any:
+    """Replace unpaired surrogates in decoded JSON with U+FFFD"""
+    if isinstance(value, str):
+        return _SURROGATE_RE.sub("\ufffd", value)
+    if isinstance(value, list):
+        return [_replace_lone_surrogates(item) for item in value]
+    if isinstance(value, dict):
+        return {
+            _replace_lone_surrogates(key): _replace_lone_surrogates(item)
+            for key, item in value.items()
+        }
+    return value
+
+
+class ORJSONRequest(Request):
+    """
+    Request whose JSON body is decoded with orjson
+
+    Bodies orjson rejects are decoded again with the stdlib json module, so
+    input it accepts, such as an escaped lone surrogate ("\\ud800") from a
+    string cut mid-emoji, still parses. Lone surrogates are then replaced
+    with U+FFFD, since they can't be encoded as UTF-8 for storage or the model.
+
+    Unlike json, orjson decodes integers wider than 64 bits as floats, so they
+    lose precision. The typed integer fields are timestamps and counts, so
+    this can only affect free-form values such as conversation log metadata.
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            try:
+                self._json = orjson.loads(body)
+            except orjson.JSONDecodeError:
+                # Malformed bodies raise json.JSONDecodeError here, which
+                # FastAPI turns into a 422
+                self._json = _replace_lone_surrogates(json.loads(body))
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """APIRoute that hands endpoints an ORJSONRequest"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
@@ -0,0 +1,43 @@
+"""Coarse wall clock refreshed by a background task"""
+
+import asyncio
+import time
+from typing import Optional
+
+TICK_INTERVAL = 0.25
+
+_now = int(time.time())
+_task: Optional[asyncio.Task] = None
+
+
+def now_int() -> int:
+    """Current Unix time in seconds, cached while the ticker is running"""
+    if _task is None or _task.done():
+        return int(time.time())
+    return _now
+
+
+async def _tick() -> None:
+    global _now
+    while True:
+        _now = int(time.time())
+        await asyncio.sleep(TICK_INTERVAL)
+
+
+def start() -> None:
+    """Start the ticker (idempotent)"""
+    global _task
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_tick())
+
+
+async def stop() -> None:
+    """Stop the ticker; now_int() falls back to time.time()"""
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -1,6 +1,6 @@
 """Application configuration using Pydantic Settings"""
 
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,6 +21,12 @@ class Settings(BaseSettings):
 
     # Firestore
     FIRESTORE_COLLECTION: str = "suggestions"
+    FIRESTORE_ENABLED: bool = False
+    FIRESTORE_LOGS_COLLECTION: str = "conversation_logs"
+    FIRESTORE_FEEDBACK_COLLECTION: str = "feedback"
+
+    # Redis response cache shared across workers (disabled when unset)
+    REDIS_URL: Optional[str] = None
 
     # Server Configuration
     PORT: int = 8080
@@ -33,6 +39,9 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
 
+    # Request size limit for conversation-log uploads
+    MAX_REQUEST_BODY_BYTES: int = 512 * 1024
+
     # Environment
     ENVIRONMENT: str = "production"
     DEBUG: bool = False
@@ -0,0 +1,8 @@
+"""Identifier generation"""
+
+from ulid import ULID
+
+
+def new_id() -> str:
+    """Generate a time-sortable unique ID (ULID)"""
+    return str(ULID())
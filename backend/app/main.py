@@ -1,10 +1,38 @@
 """FastAPI application entry point"""
 
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
+from app.core import clock
 from app.core.config import settings
+from app.middleware.body_limit import BodySizeLimitMiddleware
+from app.services.agent_service import AgentService
+from app.services.log_writer import log_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Initialize shared services once per worker"""
+    # Configure ADK's Vertex AI backend once, before any agent is built
+    os.environ.setdefault("GOOGLE_CLOUD_PROJECT", settings.GCP_PROJECT_ID)
+    os.environ.setdefault("GOOGLE_CLOUD_REGION", settings.VERTEX_AI_LOCATION)
+
+    app.state.agent_service = AgentService()
+    clock.start()
+    log_writer.start()
+
+    yield
+
+    # Flush pending log/feedback writes
+    await log_writer.stop()
+    await app.state.agent_service.close()
+    await clock.stop()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -13,6 +41,8 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -24,23 +54,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized conversation-log uploads before they are parsed. Suggest and
+# autonomous requests are already bounded by their model limits.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=settings.MAX_REQUEST_BODY_BYTES,
+    paths=["/api/conversation-logs"],
+)
+
 
 @app.get("/health")
-async def health_check() -> JSONResponse:
+async def health_check() -> ORJSONResponse:
     """Health check endpoint"""
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "status": "healthy",
             "version": "0.1.0",
             "environment": settings.ENVIRONMENT,
+            "log_queue_depth": log_writer.depth,
         }
     )
 
 
 @app.get("/")
-async def root() -> JSONResponse:
+async def root() -> ORJSONResponse:
     """Root endpoint"""
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "message": "Support Chat AI Assistant API",
             "version": "0.1.0",
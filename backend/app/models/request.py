@@ -1,8 +1,12 @@
 """Request models for API endpoints"""
 
-from typing import List, Literal, Optional
+from typing import Annotated, Any, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic.fields import Field
+from pydantic.main import BaseModel
+from pydantic.types import Discriminator, Tag
+
+from app.core.ids import new_id
 
 
 class Message(BaseModel):
@@ -24,7 +28,7 @@ class UserPreferences(BaseModel):
 class SuggestRequest(BaseModel):
     """Request for generating response suggestions"""
 
-    request_id: Optional[str] = Field(default_factory=lambda: __import__('uuid').uuid4().hex)
+    request_id: Optional[str] = Field(default_factory=new_id)
     platform: Literal["zendesk", "intercom", "generic"]
     conversation_context: List[Message] = Field(..., min_length=1, max_length=50)
     user_preferences: Optional[UserPreferences] = None
@@ -67,13 +71,50 @@ class Goal(BaseModel):
     description: str = Field(..., description="Goal description (e.g., 'Resolve shipping issue')")
     max_turns: int = Field(10, ge=1, le=50, description="Maximum conversation turns")
 
+    model_config = {"frozen": True}
 
-class GoalState(BaseModel):
-    """Current state of goal progress"""
+
+class BaseGoalState(BaseModel):
+    """Progress fields shared by every goal state"""
     active: bool = Field(True, description="Whether goal is still active")
     current_turn: int = Field(0, ge=0, description="Current turn number")
     progress: float = Field(0.0, ge=0.0, le=1.0, description="Progress toward goal (0.0-1.0)")
 
+    model_config = {"frozen": True}
+
+
+class GoalState(BaseGoalState):
+    """Current state of goal progress"""
+    kind: Literal["goal"] = Field("goal", description="State type: goal, escalated, or completed")
+
+
+class EscalatedState(BaseGoalState):
+    """Goal state after handing the conversation to a human agent"""
+    kind: Literal["escalated"] = "escalated"
+
+
+class CompletedState(BaseGoalState):
+    """Goal state after the goal was resolved or ran out of turns"""
+    kind: Literal["completed"] = "completed"
+
+
+def _goal_state_kind(value: Any) -> str:
+    """Discriminator for goal states; clients may omit kind for an in-progress goal"""
+    if isinstance(value, dict):
+        return str(value.get("kind", "goal"))
+    return str(getattr(value, "kind", "goal"))
+
+
+# Tagged union dispatched on kind, so validation and serialization pick the class directly
+AnyGoalState = Annotated[
+    Union[
+        Annotated[GoalState, Tag("goal")],
+        Annotated[EscalatedState, Tag("escalated")],
+        Annotated[CompletedState, Tag("completed")],
+    ],
+    Discriminator(_goal_state_kind),
+]
+
 
 class SafetyConstraints(BaseModel):
     """Safety constraints for autonomous mode"""
@@ -84,10 +125,12 @@ class SafetyConstraints(BaseModel):
     )
     stop_if_confused: bool = Field(True, description="Stop if AI is uncertain")
 
+    model_config = {"frozen": True}
+
 
 class AutonomousRequest(BaseModel):
     """Request for autonomous agent (YOLO mode)"""
     goal: Goal
-    goal_state: GoalState
+    goal_state: AnyGoalState
     safety_constraints: SafetyConstraints
     conversation_context: List[Message] = Field(..., min_length=1, max_length=50)
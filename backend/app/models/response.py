@@ -1,8 +1,12 @@
 """Response models for API endpoints"""
 
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Annotated, List, Optional, Dict, Any
 
-from pydantic import BaseModel, Field
+from pydantic.fields import Field
+from pydantic.main import BaseModel
+
+from app.models.request import AnyGoalState
 
 
 class Suggestion(BaseModel):
@@ -13,11 +17,14 @@ class Suggestion(BaseModel):
     reasoning: Optional[str] = Field(None, description="Explanation of suggestion")
 
 
-class Metadata(BaseModel):
-    """Metadata about the suggestion generation"""
+@dataclass(slots=True, frozen=True)
+class Metadata:
+    """Metadata about the suggestion generation (plain record, built per response)"""
 
     request_id: str
-    processing_time_ms: int = Field(..., ge=0)
+    # Documents the bound in the OpenAPI schema; instances are built directly,
+    # so it isn't checked at runtime
+    processing_time_ms: Annotated[int, Field(ge=0)]
     model_used: str
     timestamp: int
 
@@ -34,7 +41,7 @@ class AutonomousResponse(BaseModel):
 
     action: str = Field(..., description="Action taken: respond, escalate, or goal_complete")
     response_text: Optional[str] = Field(None, description="Generated response (if action=respond)")
-    updated_state: BaseModel = Field(..., description="Updated goal state")
+    updated_state: AnyGoalState = Field(..., description="Updated goal state")
     reasoning: str = Field(..., description="Explanation of decision")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence in decision")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
@@ -1,24 +1,48 @@
+from functools import cached_property
+from typing import AsyncIterator
 from app.core.config import settings
 from app.agents.suggestion_agent import SuggestionAgentService
 from app.agents.autonomous_agent import AutonomousAgentService
+from app.models.request import AutonomousRequest, SuggestRequest
+from app.models.response import AutonomousResponse, Suggestion
+from app.services.response_cache import RedisCache
 
 
 class AgentService:
     """Unified service coordinating both ADK agents"""
 
-    def __init__(self):
-        self.suggestion_agent = SuggestionAgentService(
-            project_id=settings.GCP_PROJECT_ID,
-            location=settings.VERTEX_AI_LOCATION
+    def __init__(self) -> None:
+        self.project_id = settings.GCP_PROJECT_ID
+        self.location = settings.VERTEX_AI_LOCATION
+        self.response_cache = RedisCache(settings.REDIS_URL)
+
+    # Each agent is built on first use, so a worker only pays for the modes it serves
+
+    @cached_property
+    def suggestion_agent(self) -> SuggestionAgentService:
+        return SuggestionAgentService(
+            project_id=self.project_id,
+            location=self.location,
+            shared_cache=self.response_cache
         )
 
-        self.autonomous_agent = AutonomousAgentService(
-            project_id=settings.GCP_PROJECT_ID,
-            location=settings.VERTEX_AI_LOCATION
+    @cached_property
+    def autonomous_agent(self) -> AutonomousAgentService:
+        return AutonomousAgentService(
+            project_id=self.project_id,
+            location=self.location
         )
 
-    async def generate_suggestion(self, request):
+    async def generate_suggestion(self, request: SuggestRequest) -> Suggestion:
         return await self.suggestion_agent.generate_suggestion(request)
 
-    async def generate_autonomous_response(self, request):
+    def stream_suggestion(self, request: SuggestRequest) -> AsyncIterator[str]:
+        return self.suggestion_agent.stream_suggestion(request)
+
+    async def generate_autonomous_response(
+        self, request: AutonomousRequest
+    ) -> AutonomousResponse:
         return await self.autonomous_agent.process(request)
+
+    async def close(self) -> None:
+        await self.response_cache.close()
@@ -0,0 +1,80 @@
+"""Token budgeting for conversation context sent to Gemini"""
+
+from typing import List, Sequence
+
+from app.models.request import Message
+
+# Rough Gemini estimate; close enough to bound prompt size without a tokenizer
+CHARS_PER_TOKEN = 4
+
+MAX_CONTEXT_TOKENS = 2048
+KEEP_LAST = 6
+# Older messages are cut to this many characters in the summary block
+SUMMARY_MESSAGE_CHARS = 200
+# Don't bother including a message with less room than this
+MIN_MESSAGE_CHARS = 20
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Cut text to max_chars, marking the cut with an ellipsis"""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars - 3].rstrip() + "..."
+
+
+def trim_messages(
+    msgs: Sequence[Message],
+    max_tokens: int = MAX_CONTEXT_TOKENS,
+    keep_last: int = KEEP_LAST,
+    summarize_older: bool = True,
+) -> str:
+    """
+    Format conversation messages for a prompt within a token budget
+
+    The last keep_last messages are kept verbatim, newest first, and only
+    truncated if they alone exceed the budget. Older messages are shortened
+    into an "Earlier conversation" block with whatever budget remains, or
+    dropped when summarize_older is False. The block is only labelled as
+    truncated when one of its lines was actually cut.
+
+    Args:
+        msgs: Conversation messages, oldest first
+        max_tokens: Approximate token budget for the returned text
+        keep_last: Number of most recent messages to keep verbatim
+        summarize_older: Whether to include truncated older messages
+
+    Returns:
+        Conversation text with one "ROLE: message" line per message
+    """
+    remaining = max_tokens * CHARS_PER_TOKEN
+    split = max(len(msgs) - keep_last, 0)
+
+    recent: List[str] = []
+    for msg in reversed(msgs[split:]):
+        if remaining < MIN_MESSAGE_CHARS:
+            break
+        line = _truncate(f"{msg.role.upper()}: {msg.content}", remaining)
+        recent.append(line)
+        remaining -= len(line) + 1
+
+    older: List[str] = []
+    shortened = False
+    if summarize_older:
+        for msg in reversed(msgs[:split]):
+            if remaining < MIN_MESSAGE_CHARS:
+                break
+            full = f"{msg.role.upper()}: {msg.content}"
+            line = _truncate(full, min(SUMMARY_MESSAGE_CHARS, remaining))
+            shortened = shortened or line != full
+            older.append(line)
+            remaining -= len(line) + 1
+
+    omitted = len(msgs) - len(recent) - len(older)
+    sections = []
+    if omitted:
+        sections.append(f"[{omitted} earlier messages omitted]")
+    if older:
+        header = "Earlier conversation (truncated):" if shortened else "Earlier conversation:"
+        sections.append(header + "\n" + "\n".join(reversed(older)))
+    sections.append("\n".join(reversed(recent)))
+    return "\n\n".join(sections)
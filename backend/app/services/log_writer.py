@@ -0,0 +1,135 @@
+"""Background writer that persists conversation logs and feedback in batches"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Flush thresholds and backpressure limit
+BATCH_SIZE = 100
+FLUSH_INTERVAL_MS = 200
+QUEUE_MAXSIZE = 10_000
+
+# (collection, document_id, document)
+WriteItem = Tuple[str, str, Dict[str, Any]]
+
+# Queued by stop() to tell the consumer to flush its batch and exit
+_STOP = None
+
+
+class LogWriter:
+    """Queues documents on the request path and writes them to Firestore in batches"""
+
+    def __init__(
+        self,
+        maxsize: int = QUEUE_MAXSIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval_ms: int = FLUSH_INTERVAL_MS,
+    ):
+        self._maxsize = maxsize
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000
+        # Queue, consumer and client are bound to the loop that started them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.queue: "Optional[asyncio.Queue[Optional[WriteItem]]]" = None
+        self._task: Optional[asyncio.Task] = None
+        self._client: Any = None
+
+    @property
+    def depth(self) -> int:
+        """Number of documents waiting to be written"""
+        return self.queue.qsize() if self.queue is not None else 0
+
+    def start(self) -> None:
+        """Start the consumer task on the running loop (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A queue, task or client from an earlier event loop can't be used here
+            self._loop = loop
+            self.queue = asyncio.Queue(maxsize=self._maxsize)
+            self._task = None
+            self._client = None
+
+        if self._task is None or self._task.done():
+            if settings.FIRESTORE_ENABLED and self._client is None:
+                from google.cloud import firestore
+
+                self._client = firestore.AsyncClient(project=settings.GCP_PROJECT_ID)
+            self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Let the consumer flush its current batch, then flush anything still queued"""
+        if self.queue is None or self._loop is not asyncio.get_running_loop():
+            return
+
+        if self._task is not None and not self._task.done():
+            await self.queue.put(_STOP)
+            await self._task
+        self._task = None
+
+        remaining: List[WriteItem] = []
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is not _STOP:
+                remaining.append(item)
+        for i in range(0, len(remaining), self._batch_size):
+            await self._flush(remaining[i:i + self._batch_size])
+
+    async def enqueue(self, collection: str, document_id: str, document: Dict[str, Any]) -> None:
+        """Queue a document for writing; waits when the queue is full"""
+        self.start()
+        assert self.queue is not None
+        await self.queue.put((collection, document_id, document))
+
+    async def _run(self) -> None:
+        """Drain up to BATCH_SIZE items or FLUSH_INTERVAL_MS, whichever comes first"""
+        assert self.queue is not None
+        queue = self.queue
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[WriteItem]) -> None:
+        """Write a batch with a single Firestore commit"""
+        if not batch:
+            return
+        if self._client is None:
+            logger.debug(f"Firestore disabled, dropping {len(batch)} queued writes")
+            return
+
+        try:
+            write_batch = self._client.batch()
+            for collection, document_id, document in batch:
+                write_batch.set(self._client.collection(collection).document(document_id), document)
+            await write_batch.commit()
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} documents to Firestore: {str(e)}")
+
+
+# Shared writer started with the application
+log_writer = LogWriter()
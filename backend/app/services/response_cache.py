@@ -0,0 +1,50 @@
+"""Optional Redis tier shared by all workers, behind the in-process response caches"""
+
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "support-chat-ai:"
+
+
+class RedisCache:
+    """Best-effort shared cache; disabled without a URL, and errors count as misses"""
+
+    def __init__(self, url: Optional[str] = None):
+        self._client: Any = None
+        if url:
+            import redis.asyncio as redis
+
+            self._client = redis.Redis.from_url(url)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis server is configured"""
+        return self._client is not None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value for key, or None on a miss or error"""
+        if self._client is None:
+            return None
+        try:
+            value: Optional[bytes] = await self._client.get(KEY_PREFIX + key)
+            return value
+        except Exception as e:
+            logger.warning(f"Redis cache get failed: {str(e)}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """Store value under key for ttl_seconds, ignoring errors"""
+        if self._client is None:
+            return
+        try:
+            await self._client.setex(KEY_PREFIX + key, ttl_seconds, value)
+        except Exception as e:
+            logger.warning(f"Redis cache set failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the connection pool"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
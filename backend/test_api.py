@@ -1,9 +1,20 @@
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 
 BASE_URL = "http://localhost:8001"
+TIMEOUT = 30
 
-def test_suggest_endpoint():
+def pretty(data):
+    # orjson writes UTF-8 as-is, so customer text isn't \uXXXX-escaped
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+def print_header(title):
+    print("\n" + "=" * 50)
+    print(title)
+    print("=" * 50)
+
+async def test_suggest_endpoint(client):
     """Test the suggest-response endpoint"""
     payload = {
         "platform": "zendesk",
@@ -16,12 +27,13 @@ def test_suggest_endpoint():
         ]
     }
     
-    response = requests.post(f"{BASE_URL}/api/suggest-response", json=payload)
+    response = await client.post("/api/suggest-response", json=payload)
+    print_header("Testing Suggest Response Endpoint")
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {pretty(response.json())}")
     return response.status_code == 200
 
-def test_feedback_endpoint():
+async def test_feedback_endpoint(client):
     """Test the feedback endpoint"""
     payload = {
         "request_id": "test_123",
@@ -31,18 +43,20 @@ def test_feedback_endpoint():
         "modified": False
     }
     
-    response = requests.post(f"{BASE_URL}/api/feedback", json=payload)
-    print(f"\nFeedback Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
-    return response.status_code == 200
+    response = await client.post("/api/feedback", json=payload)
+    print_header("Testing Feedback Endpoint")
+    print(f"Feedback Status Code: {response.status_code}")
+    print(f"Response: {pretty(response.json())}")
+    return response.status_code == 202
+
+async def main():
+    # Independent endpoints run concurrently over one keep-alive pool
+    limits = httpx.Limits(max_keepalive_connections=8)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=TIMEOUT, limits=limits) as client:
+        await asyncio.gather(
+            test_suggest_endpoint(client),
+            test_feedback_endpoint(client)
+        )
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("Testing Suggest Response Endpoint")
-    print("=" * 50)
-    test_suggest_endpoint()
-    
-    print("\n" + "=" * 50)
-    print("Testing Feedback Endpoint")
-    print("=" * 50)
-    test_feedback_endpoint()
+    asyncio.run(main())
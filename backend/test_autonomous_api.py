@@ -1,9 +1,20 @@
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 
 BASE_URL = "http://localhost:8001"
+TIMEOUT = 30
 
-def test_autonomous_endpoint():
+def pretty(data):
+    # orjson writes UTF-8 as-is, so customer text isn't \uXXXX-escaped
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+def print_header(title):
+    print("\n" + "=" * 50)
+    print(title)
+    print("=" * 50)
+
+async def test_autonomous_endpoint(client):
     """Test the autonomous-response endpoint"""
     payload = {
         "goal": {
@@ -29,12 +40,13 @@ def test_autonomous_endpoint():
         ]
     }
     
-    response = requests.post(f"{BASE_URL}/api/autonomous-response", json=payload)
+    response = await client.post("/api/autonomous-response", json=payload)
+    print_header("Testing Autonomous Response Endpoint")
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {pretty(response.json())}")
     return response.status_code == 200
 
-def test_conversation_logs():
+async def test_conversation_logs(client):
     """Test conversation logs endpoints"""
     # Save a log
     log_payload = {
@@ -50,24 +62,41 @@ def test_conversation_logs():
         "outcome": "completed"
     }
     
-    save_response = requests.post(f"{BASE_URL}/api/conversation-logs", json=log_payload)
-    print(f"\nSave Log Status: {save_response.status_code}")
-    print(f"Response: {json.dumps(save_response.json(), indent=2)}")
+    save_response = await client.post("/api/conversation-logs", json=log_payload)
+    print_header("Testing Conversation Logs Endpoints")
+    print(f"Save Log Status: {save_response.status_code}")
+    print(f"Response: {pretty(save_response.json())}")
     
-    # Retrieve logs
-    get_response = requests.get(f"{BASE_URL}/api/conversation-logs?mode=autonomous&page=1&page_size=10")
+    # Retrieve one page, and several pages in a single batch request
+    get_response, batch_response = await asyncio.gather(
+        client.get(
+            "/api/conversation-logs",
+            params={"mode": "autonomous", "page": 1, "page_size": 10}
+        ),
+        client.get(
+            "/api/conversation-logs/batch",
+            params={"mode": "autonomous", "pages": [1, 2, 3], "page_size": 10}
+        )
+    )
     print(f"\nGet Logs Status: {get_response.status_code}")
-    print(f"Response: {json.dumps(get_response.json(), indent=2)}")
+    print(f"Response: {pretty(get_response.json())}")
+    print(f"\nGet Log Pages Status: {batch_response.status_code}")
+    print(f"Pages: {[len(page['logs']) for page in batch_response.json()['pages']]}")
     
-    return save_response.status_code == 200 and get_response.status_code == 200
+    return (
+        save_response.status_code == 202
+        and get_response.status_code == 200
+        and batch_response.status_code == 200
+    )
+
+async def main():
+    # Independent endpoints run concurrently over one keep-alive pool
+    limits = httpx.Limits(max_keepalive_connections=8)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=TIMEOUT, limits=limits) as client:
+        await asyncio.gather(
+            test_autonomous_endpoint(client),
+            test_conversation_logs(client)
+        )
 
 if __name__ == "__main__":
-    print("=" * 50)
-    print("Testing Autonomous Response Endpoint")
-    print("=" * 50)
-    test_autonomous_endpoint()
-    
-    print("\n" + "=" * 50)
-    print("Testing Conversation Logs Endpoints")
-    print("=" * 50)
-    test_conversation_logs()
+    asyncio.run(main())
@@ -0,0 +1,6 @@
+"""Shared test configuration"""
+
+import os
+
+# Settings requires a project ID at import time
+os.environ.setdefault("GCP_PROJECT_ID", "test-project")
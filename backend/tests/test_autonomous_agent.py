@@ -0,0 +1,104 @@
+"""Tests for the autonomous agent's goal state handling"""
+
+from typing import Any, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.agents.autonomous_agent import AutonomousAgentService
+from app.main import app
+from app.models.request import (
+    AutonomousRequest,
+    CompletedState,
+    EscalatedState,
+    GoalState,
+)
+
+
+def request_body(**overrides: Any) -> Dict[str, Any]:
+    body: Dict[str, Any] = {
+        "goal": {"description": "Resolve shipping issue", "max_turns": 5},
+        "goal_state": {"active": True, "current_turn": 1, "progress": 0.2},
+        "safety_constraints": {"escalation_keywords": ["manager"]},
+        "conversation_context": [
+            {"role": "customer", "content": "Where is my order?", "timestamp": 1704067200}
+        ],
+    }
+    body.update(overrides)
+    return body
+
+
+@pytest.fixture
+def service() -> AutonomousAgentService:
+    return AutonomousAgentService(project_id="test-project", location="us-central1")
+
+
+async def test_keyword_escalation_returns_escalated_state(
+    service: AutonomousAgentService,
+) -> None:
+    request = AutonomousRequest.model_validate(request_body(conversation_context=[
+        {"role": "customer", "content": "Get me your MANAGER", "timestamp": 1704067200}
+    ]))
+
+    response = await service.process(request)
+
+    assert response.action == "escalate"
+    assert response.response_text is None
+    assert isinstance(response.updated_state, EscalatedState)
+    assert response.updated_state.active is False
+
+
+async def test_reaching_max_turns_returns_completed_state(
+    service: AutonomousAgentService,
+) -> None:
+    request = AutonomousRequest.model_validate(request_body(
+        goal_state={"active": True, "current_turn": 4, "progress": 0.8}
+    ))
+
+    response = await service.process(request)
+
+    assert response.action == "respond"
+    assert isinstance(response.updated_state, CompletedState)
+    assert response.updated_state.active is False
+    assert response.updated_state.current_turn == 5
+
+
+async def test_ongoing_goal_returns_goal_state(service: AutonomousAgentService) -> None:
+    response = await service.process(AutonomousRequest.model_validate(request_body()))
+
+    assert isinstance(response.updated_state, GoalState)
+    assert response.updated_state.active is True
+
+
+def test_goal_state_without_kind_validates_as_goal_state() -> None:
+    request = AutonomousRequest.model_validate(request_body())
+
+    assert isinstance(request.goal_state, GoalState)
+    assert request.goal_state.kind == "goal"
+
+
+def test_goal_state_kind_selects_the_state_class() -> None:
+    request = AutonomousRequest.model_validate(request_body(
+        goal_state={"kind": "escalated", "active": False, "current_turn": 2, "progress": 0.4}
+    ))
+
+    assert isinstance(request.goal_state, EscalatedState)
+
+
+def test_unknown_goal_state_kind_is_rejected() -> None:
+    with pytest.raises(ValidationError):
+        AutonomousRequest.model_validate(request_body(
+            goal_state={"kind": "paused", "active": True, "current_turn": 1, "progress": 0.2}
+        ))
+
+
+def test_unknown_goal_state_kind_returns_422() -> None:
+    body = request_body(
+        goal_state={"kind": "paused", "active": True, "current_turn": 1, "progress": 0.2}
+    )
+
+    with TestClient(app) as client:
+        response = client.post("/api/autonomous-response", json=body)
+
+    assert response.status_code == 422
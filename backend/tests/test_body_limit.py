@@ -0,0 +1,66 @@
+"""Tests for the request body size limit middleware"""
+
+from typing import Any, Dict, Iterator
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.body_limit import BodySizeLimitMiddleware
+
+LIMIT = 100
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, max_body_size=LIMIT, paths=["/limited"])
+
+    @app.post("/limited")
+    async def limited(request: Request) -> Dict[str, Any]:
+        return {"size": len(await request.body())}
+
+    @app.post("/open")
+    async def open_(request: Request) -> Dict[str, Any]:
+        return {"size": len(await request.body())}
+
+    return TestClient(app)
+
+
+def chunks(total: int, size: int = 10) -> Iterator[bytes]:
+    """Yield a body in pieces so it is sent without a Content-Length"""
+    for _ in range(total // size):
+        yield b"x" * size
+
+
+def test_body_within_limit_is_accepted() -> None:
+    response = make_client().post("/limited", content=b"x" * LIMIT)
+
+    assert response.status_code == 200
+    assert response.json() == {"size": LIMIT}
+
+
+def test_declared_oversize_body_is_rejected() -> None:
+    response = make_client().post("/limited", content=b"x" * (LIMIT + 1))
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large"}
+
+
+def test_chunked_body_within_limit_is_accepted() -> None:
+    response = make_client().post("/limited", content=chunks(LIMIT))
+
+    assert response.status_code == 200
+    assert response.json() == {"size": LIMIT}
+
+
+def test_chunked_oversize_body_is_rejected() -> None:
+    response = make_client().post("/limited", content=chunks(LIMIT * 2))
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large"}
+
+
+def test_other_paths_are_not_limited() -> None:
+    response = make_client().post("/open", content=b"x" * (LIMIT * 2))
+
+    assert response.status_code == 200
+    assert response.json() == {"size": LIMIT * 2}
@@ -0,0 +1,73 @@
+"""Tests for conversation context budgeting"""
+
+from typing import List
+
+from app.models.request import Message
+from app.services.context_budget import SUMMARY_MESSAGE_CHARS, trim_messages
+
+
+def make_messages(*contents: str) -> List[Message]:
+    return [
+        Message(role="customer", content=content, timestamp=1704067200 + i)
+        for i, content in enumerate(contents)
+    ]
+
+
+def numbered(count: int, width: int) -> List[str]:
+    """Message contents of exactly width characters, numbered oldest first"""
+    return [f"{i:02d}".ljust(width, "x") for i in range(count)]
+
+
+def test_short_conversation_is_returned_verbatim() -> None:
+    msgs = make_messages("Where is my order?", "It's #12345")
+
+    assert trim_messages(msgs) == "CUSTOMER: Where is my order?\nCUSTOMER: It's #12345"
+
+
+def test_last_messages_are_kept_verbatim() -> None:
+    contents = numbered(5, SUMMARY_MESSAGE_CHARS * 2)
+
+    sections = trim_messages(make_messages(*contents), keep_last=2).split("\n\n")
+
+    assert sections[-1] == f"CUSTOMER: {contents[3]}\nCUSTOMER: {contents[4]}"
+    # Older messages don't fit whole, so the block says they were cut
+    older = sections[-2].split("\n")
+    assert older[0] == "Earlier conversation (truncated):"
+    assert all(len(line) == SUMMARY_MESSAGE_CHARS for line in older[1:])
+    assert all(line.endswith("...") for line in older[1:])
+
+
+def test_newest_message_is_truncated_when_it_exceeds_the_budget() -> None:
+    msgs = make_messages("first message", "y" * 100)
+
+    text = trim_messages(msgs, max_tokens=10)
+
+    # 10 tokens is 40 characters, all taken by the newest message
+    assert text == "[1 earlier messages omitted]\n\nCUSTOMER: " + "y" * 27 + "..."
+
+
+def test_omitted_count_and_untruncated_older_block() -> None:
+    # Each line is "CUSTOMER: " plus 40 characters, 50 in all
+    contents = numbered(10, 40)
+
+    text = trim_messages(make_messages(*contents), max_tokens=40, keep_last=2)
+
+    # 160 characters fit the two recent lines and one older line
+    assert text.split("\n\n") == [
+        "[7 earlier messages omitted]",
+        f"Earlier conversation:\nCUSTOMER: {contents[7]}",
+        f"CUSTOMER: {contents[8]}\nCUSTOMER: {contents[9]}",
+    ]
+
+
+def test_older_messages_dropped_without_summary() -> None:
+    contents = numbered(10, 40)
+
+    text = trim_messages(
+        make_messages(*contents), max_tokens=40, keep_last=2, summarize_older=False
+    )
+
+    assert text.split("\n\n") == [
+        "[8 earlier messages omitted]",
+        f"CUSTOMER: {contents[8]}\nCUSTOMER: {contents[9]}",
+    ]
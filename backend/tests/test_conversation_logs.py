@@ -0,0 +1,141 @@
+"""Tests for the in-memory conversation log store and pagination"""
+
+from typing import Iterator, List, Optional
+
+import pytest
+
+from app.api.routes import conversation_logs as logs
+from app.api.routes.conversation_logs import ConversationLog
+
+
+@pytest.fixture(autouse=True)
+def empty_store() -> Iterator[None]:
+    """Start every test from an empty store"""
+    stores = (
+        logs._payloads,
+        logs._index_keys,
+        logs._log_fields,
+        logs._by_session,
+        logs._by_mode,
+        logs._by_session_mode,
+    )
+    for store in stores:
+        store.clear()
+    logs._all_logs.clear()
+    yield
+    for store in stores:
+        store.clear()
+    logs._all_logs.clear()
+
+
+def make_log(
+    log_id: str, timestamp: int, session_id: str = "s1", mode: str = "suggestion"
+) -> ConversationLog:
+    return ConversationLog(
+        log_id=log_id,
+        session_id=session_id,
+        mode=mode,
+        conversation_context=[],
+        actions_taken=[],
+        outcome="completed",
+        timestamp=timestamp,
+    )
+
+
+def page_ids(
+    page: int = 1,
+    page_size: int = 10,
+    session_id: Optional[str] = None,
+    mode: Optional[str] = None,
+) -> List[str]:
+    index = logs._select_index(session_id, mode)
+    return [log.log_id for log in logs._paginate(index, page, page_size).logs]
+
+
+def test_pages_are_newest_first() -> None:
+    for i, timestamp in enumerate([300, 100, 200]):
+        logs._store_log(make_log(f"log-{i}", timestamp))
+
+    assert page_ids() == ["log-0", "log-2", "log-1"]
+
+
+def test_timestamp_ties_keep_insertion_order() -> None:
+    for i in range(4):
+        logs._store_log(make_log(f"log-{i}", 100))
+
+    assert page_ids() == ["log-0", "log-1", "log-2", "log-3"]
+
+
+def test_pages_slice_the_index() -> None:
+    for i in range(5):
+        logs._store_log(make_log(f"log-{i}", 100 + i))
+
+    response = logs._paginate(logs._select_index(None, None), 2, 2)
+
+    assert [log.log_id for log in response.logs] == ["log-2", "log-1"]
+    assert response.total == 5
+    assert (response.page, response.page_size) == (2, 2)
+    assert page_ids(page=4, page_size=2) == []
+
+
+def test_filters_by_session_and_mode() -> None:
+    logs._store_log(make_log("a", 100, session_id="s1", mode="suggestion"))
+    logs._store_log(make_log("b", 200, session_id="s1", mode="autonomous"))
+    logs._store_log(make_log("c", 300, session_id="s2", mode="autonomous"))
+
+    assert page_ids(session_id="s1") == ["b", "a"]
+    assert page_ids(mode="autonomous") == ["c", "b"]
+    assert page_ids(session_id="s1", mode="autonomous") == ["b"]
+    assert page_ids(session_id="missing") == []
+
+
+def test_resave_replaces_log_in_every_index() -> None:
+    logs._store_log(make_log("a", 100, session_id="s1", mode="suggestion"))
+    logs._store_log(make_log("b", 200))
+    logs._store_log(make_log("a", 300, session_id="s2", mode="autonomous"))
+
+    assert page_ids() == ["a", "b"]
+    assert page_ids(session_id="s1") == ["b"]
+    assert page_ids(mode="suggestion") == ["b"]
+    assert page_ids(session_id="s1", mode="suggestion") == ["b"]
+    assert page_ids(session_id="s2", mode="autonomous") == ["a"]
+    assert logs._paginate(logs._select_index(None, None), 1, 10).total == 2
+
+
+def test_resave_with_same_timestamp_keeps_position() -> None:
+    for log_id in ["a", "b", "c"]:
+        logs._store_log(make_log(log_id, 100))
+    logs._store_log(make_log("b", 100))
+
+    assert page_ids() == ["a", "b", "c"]
+
+
+def test_resave_drops_emptied_filter_indexes() -> None:
+    logs._store_log(make_log("a", 100, session_id="s1", mode="suggestion"))
+    logs._store_log(make_log("a", 100, session_id="s2", mode="autonomous"))
+
+    assert list(logs._by_session) == ["s2"]
+    assert list(logs._by_mode) == ["autonomous"]
+    assert list(logs._by_session_mode) == [("s2", "autonomous")]
+
+
+def test_stored_logs_skip_the_size_check() -> None:
+    big = [{"content": "x" * (logs.MAX_LOG_FIELD_BYTES // 2)}] * 3
+    fields = {**make_log("a", 100).model_dump(), "actions_taken": big}
+    log = ConversationLog.model_construct(**fields)
+    logs._store_log(log)
+
+    assert page_ids() == ["a"]
+
+
+def test_new_logs_over_the_size_limit_are_rejected() -> None:
+    big = [{"content": "x" * (logs.MAX_LOG_FIELD_BYTES // 2)}] * 3
+
+    with pytest.raises(ValueError):
+        ConversationLog(
+            session_id="s1",
+            mode="suggestion",
+            conversation_context=big,
+            actions_taken=[],
+            outcome="completed",
+        )
@@ -0,0 +1,114 @@
+"""Tests for the batched background log writer"""
+
+import asyncio
+from typing import List
+
+from app.services.log_writer import LogWriter, WriteItem
+
+
+def recording_writer(batches: List[List[WriteItem]], **kwargs: int) -> LogWriter:
+    """LogWriter whose flushes are recorded instead of sent to Firestore"""
+    writer = LogWriter(**kwargs)
+
+    async def flush(batch: List[WriteItem]) -> None:
+        if batch:
+            batches.append(list(batch))
+
+    writer._flush = flush  # type: ignore[method-assign]
+    return writer
+
+
+def flushed_ids(batches: List[List[WriteItem]]) -> List[str]:
+    return [document_id for batch in batches for _, document_id, _ in batch]
+
+
+async def test_flushes_full_batch() -> None:
+    batches: List[List[WriteItem]] = []
+    writer = recording_writer(batches, batch_size=3, flush_interval_ms=10_000)
+
+    for i in range(3):
+        await writer.enqueue("logs", f"log-{i}", {"i": i})
+    await asyncio.sleep(0.01)
+
+    assert batches == [[("logs", f"log-{i}", {"i": i}) for i in range(3)]]
+    await writer.stop()
+
+
+async def test_flushes_partial_batch_after_interval() -> None:
+    batches: List[List[WriteItem]] = []
+    writer = recording_writer(batches, batch_size=100, flush_interval_ms=20)
+
+    await writer.enqueue("logs", "log-0", {})
+    assert writer.depth == 1
+    await asyncio.sleep(0.1)
+
+    assert flushed_ids(batches) == ["log-0"]
+    assert writer.depth == 0
+    await writer.stop()
+
+
+async def test_stop_flushes_in_progress_batch() -> None:
+    batches: List[List[WriteItem]] = []
+    writer = recording_writer(batches, batch_size=100, flush_interval_ms=10_000)
+
+    for i in range(5):
+        await writer.enqueue("logs", f"log-{i}", {})
+    # Let the consumer pick up the items into its batch
+    await asyncio.sleep(0.01)
+    await writer.stop()
+
+    assert flushed_ids(batches) == [f"log-{i}" for i in range(5)]
+
+
+async def test_stop_flushes_items_still_queued() -> None:
+    batches: List[List[WriteItem]] = []
+    writer = recording_writer(batches, batch_size=2, flush_interval_ms=10_000)
+
+    for i in range(5):
+        await writer.enqueue("logs", f"log-{i}", {})
+    await writer.stop()
+
+    assert flushed_ids(batches) == [f"log-{i}" for i in range(5)]
+    assert all(len(batch) <= 2 for batch in batches)
+
+
+async def test_start_is_idempotent() -> None:
+    writer = LogWriter()
+    writer.start()
+    task = writer._task
+    writer.start()
+
+    assert writer._task is task
+    await writer.stop()
+
+
+async def test_stop_without_start_is_noop() -> None:
+    await LogWriter().stop()
+
+
+def test_rebinds_to_new_event_loop() -> None:
+    batches: List[List[WriteItem]] = []
+    writer = recording_writer(batches, batch_size=100, flush_interval_ms=10_000)
+    queues = []
+
+    async def session(document_id: str) -> None:
+        await writer.enqueue("logs", document_id, {})
+        queues.append(writer.queue)
+        await writer.stop()
+
+    asyncio.run(session("first"))
+    asyncio.run(session("second"))
+
+    assert queues[0] is not queues[1]
+    assert flushed_ids(batches) == ["first", "second"]
+
+
+def test_stop_from_other_loop_is_noop() -> None:
+    writer = LogWriter()
+
+    async def start() -> None:
+        writer.start()
+
+    asyncio.run(start())
+    # The consumer belongs to the first (closed) loop; don't touch it from here
+    asyncio.run(writer.stop())
@@ -0,0 +1,55 @@
+"""Tests for orjson request body decoding"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api.routing import ORJSONRoute
+
+
+def make_client() -> TestClient:
+    router = APIRouter(route_class=ORJSONRoute)
+
+    @router.post("/echo")
+    async def echo(request: Request) -> Dict[str, Any]:
+        return {"body": await request.json()}
+
+    @router.post("/items")
+    async def items(item: Dict[str, str]) -> Dict[str, str]:
+        return item
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def post_raw(path: str, body: bytes) -> Any:
+    return make_client().post(path, content=body, headers={"Content-Type": "application/json"})
+
+
+def test_body_is_decoded() -> None:
+    response = post_raw("/items", b'{"name": "caf\\u00e9"}')
+
+    assert response.status_code == 200
+    assert response.json() == {"name": "café"}
+
+
+def test_lone_surrogate_falls_back_to_stdlib_json() -> None:
+    response = post_raw("/items", b'{"name": "cut \\ud83d", "pair": "\\ud83d\\ude00"}')
+
+    assert response.status_code == 200
+    assert response.json() == {"name": "cut \ufffd", "pair": "\U0001f600"}
+
+
+def test_wide_integers_decode_as_floats() -> None:
+    response = post_raw("/echo", b"[123456789012345678901234567890]")
+
+    assert response.status_code == 200
+    assert response.json() == {"body": [1.2345678901234568e29]}
+
+
+def test_malformed_body_returns_422() -> None:
+    response = post_raw("/items", b'{"name": ')
+
+    assert response.status_code == 422
@@ -0,0 +1,56 @@
+"""Tests for the safety constraint tools"""
+
+from app.agents.tools.safety_tools import check_safety_constraints, find_escalation_keyword
+
+
+def test_overlapping_keywords_are_all_reported() -> None:
+    constraints = {"escalation_keywords": ["manager", "manage", "age"]}
+
+    result = check_safety_constraints("Let me talk to your MANAGER", constraints, 0.9)
+
+    assert result["decision"] == "escalate"
+    assert result["triggers"] == [
+        "escalation_keyword:manager",
+        "escalation_keyword:manage",
+        "escalation_keyword:age",
+    ]
+
+
+def test_keywords_match_case_insensitively() -> None:
+    constraints = {"escalation_keywords": ["Lawsuit"]}
+
+    result = check_safety_constraints("this calls for a lawsuit", constraints, 0.9)
+
+    assert result["triggers"] == ["escalation_keyword:Lawsuit"]
+
+
+def test_low_confidence_and_confusion() -> None:
+    constraints = {"escalation_keywords": [], "min_confidence": 0.7}
+
+    result = check_safety_constraints("I'm not sure about that", constraints, 0.5)
+
+    assert result["triggers"] == ["low_confidence:0.50", "confusion_detected"]
+
+
+def test_confusion_check_can_be_disabled() -> None:
+    constraints = {"escalation_keywords": [], "stop_if_confused": False}
+
+    result = check_safety_constraints("I don't understand", constraints, 0.9)
+
+    assert result == {"decision": "safe", "reason": "All checks passed", "triggers": []}
+
+
+def test_find_escalation_keyword_returns_the_original_keyword() -> None:
+    texts = ["hello", "I want a REFUND and a manager"]
+
+    assert find_escalation_keyword(texts, ["Manager", "refund"]) == "Manager"
+
+
+def test_find_escalation_keyword_overlapping_keywords() -> None:
+    assert find_escalation_keyword(["get me the manager"], ["manager", "manage"]) == "manager"
+    assert find_escalation_keyword(["can you manage it"], ["manager", "manage"]) == "manage"
+
+
+def test_find_escalation_keyword_no_match() -> None:
+    assert find_escalation_keyword(["all good"], ["angry", ""]) is None
+    assert find_escalation_keyword(["angry"], []) is None
@@ -0,0 +1,182 @@
+"""Tests for the suggestion agent service"""
+
+import asyncio
+from typing import Any, AsyncIterator, List
+
+import orjson
+import pytest
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from app.agents import suggestion_agent
+from app.agents.suggestion_agent import SuggestionAgentService
+from app.models.request import SuggestRequest
+
+
+def make_request(*contents: str) -> SuggestRequest:
+    return SuggestRequest(
+        platform="generic",
+        conversation_context=[
+            {"role": "customer", "content": content, "timestamp": 1704067200 + i}
+            for i, content in enumerate(contents)
+        ],
+    )
+
+
+def text_event(text: str, partial: bool = False) -> Event:
+    return Event(
+        author="suggestion_agent",
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        partial=partial,
+    )
+
+
+class FakeRunner:
+    """Runner that replays fixed events instead of calling the model"""
+
+    def __init__(self, events: List[Event]):
+        self.events = events
+        self.session_service = InMemorySessionService()
+        self.prompts: List[str] = []
+
+    async def run_async(self, **kwargs: Any) -> AsyncIterator[Event]:
+        self.prompts.append(kwargs["new_message"].parts[0].text)
+        for event in self.events:
+            yield event
+
+
+@pytest.fixture
+def service() -> SuggestionAgentService:
+    return SuggestionAgentService(project_id="test-project", location="us-central1")
+
+
+class CountingAgent:
+    """Stand-in for _run_agent that counts model calls"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"reply {self.calls}"
+
+
+async def test_repeated_request_hits_the_cache(
+    service: SuggestionAgentService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    agent = CountingAgent()
+    monkeypatch.setattr(service, "_run_agent", agent)
+
+    first = await service.generate_suggestion(make_request("Where is my order?"))
+    second = await service.generate_suggestion(make_request("Where is my order?"))
+
+    assert agent.calls == 1
+    assert second is first
+
+
+async def test_different_requests_are_generated_separately(
+    service: SuggestionAgentService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    agent = CountingAgent()
+    monkeypatch.setattr(service, "_run_agent", agent)
+
+    await service.generate_suggestion(make_request("Where is my order?"))
+    await service.generate_suggestion(make_request("Where is my refund?"))
+
+    assert agent.calls == 2
+
+
+async def test_concurrent_identical_requests_share_one_call(
+    service: SuggestionAgentService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    agent = CountingAgent(delay=0.01)
+    monkeypatch.setattr(service, "_run_agent", agent)
+
+    suggestions = await asyncio.gather(
+        *(service.generate_suggestion(make_request("Where is my order?")) for _ in range(5))
+    )
+
+    assert agent.calls == 1
+    assert {s.text for s in suggestions} == {"reply 1"}
+    assert service._inflight == {}
+
+
+async def test_trivial_message_skips_the_model(
+    service: SuggestionAgentService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    agent = CountingAgent()
+    monkeypatch.setattr(service, "_run_agent", agent)
+
+    suggestion = await service.generate_suggestion(make_request("Where is my order?", "thanks!"))
+
+    assert agent.calls == 0
+    assert suggestion.text == suggestion_agent._ACK_REPLY
+    assert service.trivial_hits == 1
+
+
+async def collect(stream: AsyncIterator[str]) -> List[dict]:
+    frames = []
+    async for frame in stream:
+        assert frame.startswith("data: ") and frame.endswith("\n\n")
+        frames.append(orjson.loads(frame[len("data: "):]))
+    return frames
+
+
+async def test_stream_yields_partial_chunks_once(
+    service: SuggestionAgentService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runner = FakeRunner([
+        text_event("I can ", partial=True),
+        text_event("help.", partial=True),
+        text_event("I can help."),
+    ])
+    monkeypatch.setattr(suggestion_agent, "get_suggestion_runner", lambda: runner)
+
+    frames = await collect(service.stream_suggestion(make_request("Where is my order?")))
+
+    assert frames[:-1] == [{"delta": "I can "}, {"delta": "help."}]
+    assert frames[-1]["done"] is True
+    assert "Where is my order?" in runner.prompts[0]
+
+
+async def test_stream_yields_unstreamed_final_text(
+    service: SuggestionAgentService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runner = FakeRunner([text_event("Let me check.")])
+    monkeypatch.setattr(suggestion_agent, "get_suggestion_runner", lambda: runner)
+
+    frames = await collect(service.stream_suggestion(make_request("Where is my order?")))
+
+    assert frames[0] == {"delta": "Let me check."}
+
+
+async def test_stream_deletes_its_session(
+    service: SuggestionAgentService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runner = FakeRunner([text_event("Done.")])
+    monkeypatch.setattr(suggestion_agent, "get_suggestion_runner", lambda: runner)
+
+    await collect(service.stream_suggestion(make_request("Where is my order?")))
+
+    sessions = await runner.session_service.list_sessions(
+        app_name=suggestion_agent.APP_NAME, user_id=suggestion_agent.STREAM_USER_ID
+    )
+    assert sessions.sessions == []
+
+
+async def test_stream_reports_errors_as_an_event(
+    service: SuggestionAgentService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class FailingRunner(FakeRunner):
+        async def run_async(self, **kwargs: Any) -> AsyncIterator[Event]:
+            raise RuntimeError("model unavailable")
+            yield  # pragma: no cover
+
+    monkeypatch.setattr(suggestion_agent, "get_suggestion_runner", lambda: FailingRunner([]))
+
+    frames = await collect(service.stream_suggestion(make_request("Where is my order?")))
+
+    assert frames == [{"error": "Failed to generate suggestion: model unavailable"}]